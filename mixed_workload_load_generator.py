@@ -0,0 +1,458 @@
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import contextlib
+import datetime
+import math
+import os
+import random
+import sys
+import threading
+import time
+
+import bookstore_management as bookstore
+import social_media_analytics as social
+import university_management_system as university
+
+# Default operation mix (relative weights). Reads dominate, as in most workloads.
+DEFAULT_MIX = {
+    "find_books_by_genre": 30,
+    "get_top_posts": 20,
+    "get_student_transcript": 20,
+    "add_comment": 15,
+    "update_post_likes": 10,
+    "update_book_price": 5,
+}
+
+GENRES = ["Classic", "Fiction", "Science Fiction", "Fantasy", "Mystery"]
+
+def seed_data(num_books=200, num_users=50, num_posts=1000, num_students=200, num_professors=20, num_courses=40):
+    """
+    Seed all three databases with data for the load run.
+
+    The bookstore script has no data generator, so books are inserted here.
+    The social media and university data come from their own generate_sample_data().
+
+    Parameters:
+    num_books (int): The number of books to insert. Defaults to 200.
+    num_users (int): The number of social media users. Defaults to 50.
+    num_posts (int): The number of social media posts. Defaults to 1000.
+    num_students (int): The number of university students. Defaults to 200.
+    num_professors (int): The number of university professors. Defaults to 20.
+    num_courses (int): The number of university courses. Defaults to 40.
+
+    Returns:
+    dict: The ids the operations pick from (book_ids, post_ids, user_ids, student_ids).
+
+    If seeding fails partway, the stages that had started are cleaned up
+    before the original exception is re-raised. A failure of that cleanup is
+    reported on stderr so it does not hide the original error.
+    """
+    books = [{
+        "title": f"Book {i}",
+        "author": f"Author {i % 50}",
+        "genre": random.choice(GENRES),
+        "published_date": datetime.datetime(1900, 1, 1) + datetime.timedelta(days=random.randint(0, 45000)),
+        "price": round(random.uniform(5.0, 50.0), 2)
+    } for i in range(num_books)]
+    started = []
+    try:
+        started.append("books")
+        book_ids = bookstore.collection.insert_many(books).inserted_ids
+        started.append("social")
+        social.generate_sample_data(num_users, num_posts)
+        started.append("university")
+        university.generate_sample_data(num_students, num_professors, num_courses)
+    except Exception:
+        # insert_many() assigns an _id to each document before sending it,
+        # so the books that may have been inserted are still known here
+        try:
+            cleanup_data({"book_ids": [book["_id"] for book in books if "_id" in book]}, started)
+        except Exception as cleanup_error:
+            print(f"Cleanup after failed seeding also failed: {cleanup_error!r}", file=sys.stderr)
+        raise
+
+    return {
+        "book_ids": book_ids,
+        "post_ids": [post["_id"] for post in social.posts.find({}, {"_id": 1})],
+        "user_ids": [user["_id"] for user in social.users.find({}, {"_id": 1})],
+        "student_ids": [f"S{i:04d}" for i in range(num_students)]
+    }
+
+def cleanup_data(ids, stages=("books", "social", "university")):
+    """
+    Remove everything seed_data() created.
+
+    Parameters:
+    ids (dict): The ids returned by seed_data(); only book_ids is used.
+    stages (iterable): The seeding stages to clean up. Defaults to all of them.
+
+    Returns:
+    None
+    """
+    if "books" in stages:
+        bookstore.collection.delete_many({"_id": {"$in": ids["book_ids"]}})
+    if "social" in stages:
+        social.cleanup_database()
+    if "university" in stages:
+        university.cleanup_database()
+
+def build_operations(ids):
+    """
+    Build the callable for each operation in the mix.
+
+    Each callable picks random arguments from the seeded ids and fully consumes
+    any cursor, so the measured latency includes fetching the results.
+
+    Parameters:
+    ids (dict): The ids returned by seed_data().
+
+    Returns:
+    dict: Operation name mapped to a zero-argument callable.
+    """
+    return {
+        "find_books_by_genre": lambda: list(bookstore.find_books_by_genre(random.choice(GENRES))),
+        "get_top_posts": lambda: social.get_top_posts(10, random.choice(["likes", "created_at"])),
+        "get_student_transcript": lambda: university.get_student_transcript(random.choice(ids["student_ids"])),
+        "add_comment": lambda: social.add_comment(random.choice(ids["post_ids"]), random.choice(ids["user_ids"]), "Load test comment"),
+        "update_post_likes": lambda: social.update_post_likes(10),
+        "update_book_price": lambda: bookstore.update_book_price(random.choice(ids["book_ids"]), round(random.uniform(5.0, 50.0), 2)),
+    }
+
+def parse_mix(spec):
+    """
+    Parse an operation mix such as "get_top_posts=3,add_comment=1".
+
+    Parameters:
+    spec (str): Comma-separated name=weight pairs.
+
+    Returns:
+    dict: Operation name mapped to its weight.
+
+    Raises:
+    argparse.ArgumentTypeError: if an operation is unknown, a weight is not a
+    non-negative number, or all weights are zero.
+    """
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}'. Choose from: {', '.join(DEFAULT_MIX)}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Weight of '{name}' must be a number, got '{weight}'")
+        if not mix[name] >= 0:
+            raise argparse.ArgumentTypeError(f"Weight of '{name}' must not be negative, got {weight}")
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("At least one operation must have a positive weight")
+    return mix
+
+def positive_float(value):
+    """
+    Argparse type for a number greater than zero.
+
+    Parameters:
+    value (str): The command-line value.
+
+    Returns:
+    float: The parsed value.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a number")
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def positive_int(value):
+    """
+    Argparse type for an integer greater than zero.
+
+    Parameters:
+    value (str): The command-line value.
+
+    Returns:
+    int: The parsed value.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not an integer")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Parameters:
+    sorted_values (list): The values, sorted ascending.
+    pct (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+    float: The percentile value, or 0.0 for an empty list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class LoadStats:
+    """
+    Thread-safe latency and error collector.
+
+    Latencies are kept per operation both for the current reporting interval
+    and for the whole run, so a report can be printed over time and at the end.
+    Each entry holds the latencies of successful operations, the error count,
+    the error count per exception type, and the number of dropped operations.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.interval = {}
+        self.total = {}
+        self.elapsed = 0.0
+
+    def entries(self, name):
+        """
+        Get the interval and total entries of an operation, creating them if needed.
+
+        The caller must hold the lock.
+
+        Parameters:
+        name (str): The operation name.
+
+        Returns:
+        tuple: The interval entry and the total entry.
+        """
+        return tuple(
+            bucket.setdefault(name, {"latencies": [], "errors": 0, "error_types": {}, "dropped": 0})
+            for bucket in (self.interval, self.total)
+        )
+
+    def record(self, name, latency, error=None):
+        """
+        Record the outcome of one operation.
+
+        Parameters:
+        name (str): The operation name.
+        latency (float): Seconds from the scheduled start to completion.
+        error (Exception): The exception the operation raised, if any. Defaults to None.
+
+        Returns:
+        None
+        """
+        with self.lock:
+            for entry in self.entries(name):
+                if error is None:
+                    entry["latencies"].append(latency)
+                else:
+                    entry["errors"] += 1
+                    error_type = type(error).__name__
+                    entry["error_types"][error_type] = entry["error_types"].get(error_type, 0) + 1
+
+    def record_drop(self, name):
+        """
+        Record an operation that was never run, because too much work was
+        outstanding when it was due or because the step ended first.
+
+        Parameters:
+        name (str): The operation name.
+
+        Returns:
+        None
+        """
+        with self.lock:
+            for entry in self.entries(name):
+                entry["dropped"] += 1
+
+    def take_interval(self):
+        """
+        Return the statistics of the current interval and start a new one.
+
+        Returns:
+        dict: Operation name mapped to its entry for the interval just ended.
+        """
+        with self.lock:
+            interval, self.interval = self.interval, {}
+        return interval
+
+def format_report(title, buckets, elapsed, out):
+    """
+    Print throughput, p50/p99 latency, error and drop counts per operation.
+
+    Throughput counts completed operations, successful or not. Latency
+    percentiles cover successful operations only. Errors are broken down by
+    exception type below the table.
+
+    Parameters:
+    title (str): The heading of the report.
+    buckets (dict): Operation name mapped to its LoadStats entry.
+    elapsed (float): The seconds the buckets cover.
+    out (file): The stream to print to.
+
+    Returns:
+    None
+    """
+    total_ops = sum(len(b["latencies"]) + b["errors"] for b in buckets.values())
+    total_errors = sum(b["errors"] for b in buckets.values())
+    total_dropped = sum(b["dropped"] for b in buckets.values())
+    print(f"\n{title}: {total_ops / elapsed:.1f} ops/s, {total_errors} errors, {total_dropped} dropped", file=out)
+    print(f"  {'operation':<24}{'ops':>8}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'dropped':>9}", file=out)
+    for name in sorted(buckets):
+        latencies = sorted(buckets[name]["latencies"])
+        completed = len(latencies) + buckets[name]["errors"]
+        print(f"  {name:<24}{completed:>8}{completed / elapsed:>10.1f}"
+              f"{percentile(latencies, 50) * 1000:>10.2f}{percentile(latencies, 99) * 1000:>10.2f}"
+              f"{buckets[name]['errors']:>8}{buckets[name]['dropped']:>9}", file=out)
+    for name in sorted(buckets):
+        error_types = buckets[name]["error_types"]
+        if error_types:
+            details = ", ".join(f"{error_type}={count}" for error_type, count in sorted(error_types.items()))
+            print(f"  {name} errors: {details}", file=out)
+
+def run_load(operations, mix, rate, duration, workers, interval, max_outstanding, out):
+    """
+    Run the operation mix against MongoDB at a target rate.
+
+    Operations are dispatched open-loop: the n-th operation is scheduled at
+    start + n / rate regardless of how earlier ones are doing, and its latency
+    is measured from that scheduled time. Once the worker pool saturates,
+    queueing delay therefore shows up in the latency instead of silently
+    lowering the offered rate, which is what exposes the knee of the curve.
+
+    At most max_outstanding operations are queued or running at once. An
+    operation that comes due while the cap is reached is dropped instead of
+    queued, so a step past the knee still ends after about `duration` seconds.
+    Every step runs for the full duration. Operations that have still not
+    started by then are cancelled and counted as dropped too. Throughput is
+    computed over the step, including the wait for running operations.
+
+    Parameters:
+    operations (dict): Operation name mapped to a zero-argument callable.
+    mix (dict): Operation name mapped to its weight.
+    rate (float): The target number of operations per second.
+    duration (float): How long to run, in seconds.
+    workers (int): The number of worker threads.
+    interval (float): Seconds between interval reports.
+    max_outstanding (int): The maximum number of queued or running operations.
+    out (file): The stream to print reports to.
+
+    Returns:
+    LoadStats: The statistics collected during the run.
+    """
+    stats = LoadStats()
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    slots = threading.BoundedSemaphore(max_outstanding)
+
+    def execute(name, scheduled):
+        try:
+            operations[name]()
+        except Exception as e:
+            stats.record(name, time.perf_counter() - scheduled, e)
+        else:
+            stats.record(name, time.perf_counter() - scheduled)
+        finally:
+            slots.release()
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = []
+    start = time.perf_counter()
+    next_report = start + interval
+    last_report = start
+    stop = start + duration
+    try:
+        n = 0
+        while True:
+            now = time.perf_counter()
+            if now >= stop:
+                break
+            if now >= next_report and next_report < stop:
+                format_report(f"[{now - start:6.1f}s] target {rate:g} ops/s", stats.take_interval(), now - last_report, out)
+                last_report = now
+                while next_report <= now:
+                    next_report += interval
+                pending = [(name, future) for name, future in pending if not future.done()]
+            scheduled = start + n / rate
+            if scheduled > now:
+                time.sleep(max(0.0, min(scheduled, next_report, stop) - now))
+                continue
+            name = random.choices(names, weights)[0]
+            if slots.acquire(blocking=False):
+                pending.append((name, executor.submit(execute, name, scheduled)))
+            else:
+                stats.record_drop(name)
+            n += 1
+    finally:
+        # At the end of the step (or on interruption), cancel what has still
+        # not started, then wait only for the running operations.
+        for name, future in pending:
+            if future.cancel():
+                stats.record_drop(name)
+        executor.shutdown(wait=True)
+    end = time.perf_counter()
+    elapsed = end - start
+    format_report(f"[{elapsed:6.1f}s] target {rate:g} ops/s", stats.take_interval(), end - last_report, out)
+    stats.elapsed = elapsed
+    format_report(f"Total at target {rate:g} ops/s ({elapsed:.1f}s)", stats.total, elapsed, out)
+    return stats
+
+def parse_args(argv=None):
+    """
+    Parse the command-line arguments.
+
+    Parameters:
+    argv (list): The arguments to parse. Defaults to None, meaning sys.argv.
+
+    Returns:
+    argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Run a concurrent mix of bookstore, social media and university operations against MongoDB.")
+    parser.add_argument("--rate", type=positive_float, nargs="+", default=[50.0],
+                        help="Target ops/s. Several values run one step each, to sweep for the latency knee.")
+    parser.add_argument("--duration", type=positive_float, default=30.0, help="Seconds to run each rate step.")
+    parser.add_argument("--workers", type=positive_int, default=16, help="Number of worker threads.")
+    parser.add_argument("--interval", type=positive_float, default=5.0, help="Seconds between interval reports.")
+    parser.add_argument("--max-outstanding", type=positive_int, default=256,
+                        help="Maximum queued or running operations. Operations due beyond this are dropped.")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Operation weights, e.g. 'get_top_posts=3,add_comment=1'. Defaults to all six operations.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    out = sys.stdout
+    ids = None
+    try:
+        ids = seed_data()
+        operations = build_operations(ids)
+        summary = []
+        for rate in args.rate:
+            # update_post_likes() prints on every call, so silence stdout during the run.
+            # Reports go to the saved stream, and errors are reported by exception type.
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                stats = run_load(operations, args.mix, rate, args.duration, args.workers, args.interval, args.max_outstanding, out)
+            latencies = sorted(l for b in stats.total.values() for l in b["latencies"])
+            errors = sum(b["errors"] for b in stats.total.values())
+            dropped = sum(b["dropped"] for b in stats.total.values())
+            summary.append((rate, (len(latencies) + errors) / stats.elapsed, percentile(latencies, 50), percentile(latencies, 99), errors, dropped))
+
+        print("\nRate sweep summary:")
+        print(f"  {'target ops/s':>12}{'achieved':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'dropped':>9}")
+        for rate, achieved, p50, p99, errors, dropped in summary:
+            print(f"  {rate:>12g}{achieved:>10.1f}{p50 * 1000:>10.2f}{p99 * 1000:>10.2f}{errors:>8}{dropped:>9}")
+
+    finally:
+        # Clean up the seeded data
+        if ids is not None:
+            cleanup_data(ids)
+
+        # Close the connections
+        bookstore.client.close()
+        social.client.close()
+        university.client.close()